@@ -0,0 +1,213 @@
+"""
+Headless batch mode: download a queue of torrent files without a player,
+reporting progress as JSON lines.
+"""
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Iterable, Optional, Union
+
+from downloader import TorrentDownloader
+from engine import TorrentEngine
+
+
+@dataclass
+class BatchItem:
+    """A single queued download: a magnet, a file selector and a priority."""
+    magnet: str
+    file: Optional[Union[int, str]] = None  # None picks the main video file
+    # Higher priorities start first; it only orders the queue, every running
+    # download gets the same bandwidth
+    priority: int = 0
+
+
+def parse_items(lines: Iterable[str]) -> list[BatchItem]:
+    """
+    Parse batch input. Each non-empty line that is not a '#' comment is either
+    a JSON object with "magnet", "file" and "priority" keys, or a magnet
+    followed by an optional file index or name fragment.
+
+    Raises ValueError, naming the line, on malformed input.
+    """
+    items = []
+    for lineno, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        # Magnets never start with a bracket, so these lines are meant as JSON
+        if line.startswith(('{', '[')):
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Line {lineno}: invalid JSON: {e}") from None
+            if not isinstance(data, dict):
+                raise ValueError(f"Line {lineno}: expected a JSON object")
+            if not isinstance(data.get('magnet'), str):
+                raise ValueError(f"Line {lineno}: missing 'magnet'")
+            priority = data.get('priority', 0)
+            # bool is an int subclass, but "priority": true is a mistake
+            if not isinstance(priority, int) or isinstance(priority, bool):
+                raise ValueError(f"Line {lineno}: 'priority' must be an integer")
+            file = data.get('file')
+            if file is not None and (not isinstance(file, (int, str)) or isinstance(file, bool)):
+                raise ValueError(f"Line {lineno}: 'file' must be an index or a name fragment")
+            item = BatchItem(
+                magnet=data['magnet'],
+                file=_parse_selector(file),
+                priority=priority,
+            )
+        else:
+            magnet, _, selector = line.partition(' ')
+            item = BatchItem(magnet=magnet, file=_parse_selector(selector))
+        items.append(item)
+    return items
+
+
+def _parse_selector(selector: Optional[Union[int, str]]) -> Optional[Union[int, str]]:
+    """A file selector: digits are an index, other text a name fragment."""
+    if isinstance(selector, str):
+        selector = selector.strip()
+        if selector.isdigit():
+            return int(selector)
+        return selector or None
+    return selector
+
+
+class BatchDownloader:
+    """
+    Downloads BatchItems on a shared session with bounded concurrency.
+
+    Items are grouped by info-hash: libtorrent keeps a single handle per
+    torrent, so all files wanted from one torrent share one engine, are
+    selected together and the torrent is only removed after the last of them.
+    """
+
+    def __init__(
+        self,
+        engine: TorrentEngine,
+        jobs: int = 2,
+        out: IO[str] = sys.stdout,
+        interval: float = 1.0,
+        metadata_timeout: Optional[float] = 300.0,
+    ):
+        self.engine = engine
+        self.jobs = jobs
+        self.out = out
+        self.interval = interval
+        self.metadata_timeout = metadata_timeout
+        self._out_lock = threading.Lock()
+        # Set on Ctrl-C so running downloads wind down and save resume data
+        self._stop = threading.Event()
+
+    def run(self, items: list[BatchItem]) -> int:
+        """Download every item, highest priority first; return the failure count."""
+        failed = 0
+        groups: dict[str, list[BatchItem]] = {}
+        # A torrent starts at the priority of its most urgent item
+        for item in sorted(items, key=lambda item: -item.priority):
+            try:
+                info_hash = self.engine.info_hash(item.magnet)
+            except Exception as e:
+                self._emit('error', item, error=f"Invalid magnet: {e}")
+                failed += 1
+                continue
+            groups.setdefault(info_hash, []).append(item)
+
+        pool = ThreadPoolExecutor(max_workers=self.jobs)
+        try:
+            futures = [pool.submit(self._download, group) for group in groups.values()]
+            failed += sum(future.result() for future in futures)
+        except KeyboardInterrupt:
+            self._stop.set()
+            raise
+        finally:
+            # Queued torrents are dropped; running ones see _stop and exit
+            pool.shutdown(wait=True, cancel_futures=True)
+        return failed
+
+    def _download(self, items: list[BatchItem]) -> int:
+        """Download the items of one torrent; return how many failed."""
+        engine = self.engine.spawn()
+        downloader = TorrentDownloader(engine)
+        # Items neither done nor failed yet, and the file each one resolved to
+        pending = {id(item): item for item in items}
+        files: dict[int, tuple[int, int]] = {}
+        failed = 0
+        try:
+            engine.add_magnet(items[0].magnet)
+            for item in items:
+                self._emit('fetching', item)
+            metadata = engine.fetch_metadata(self.metadata_timeout, cancel=self._stop)
+
+            for item in items:
+                try:
+                    file_index = downloader.resolve_file_choice(metadata, item.file)
+                except (IndexError, FileNotFoundError, TypeError) as e:
+                    self._emit('error', item, error=str(e))
+                    del pending[id(item)]
+                    failed += 1
+                    continue
+                file_size = metadata.sizes[file_index]
+                files[id(item)] = (file_index, file_size)
+                self._emit('started', item, name=metadata.name, file=metadata.paths[file_index],
+                           index=file_index, total=file_size)
+            if pending:
+                downloader.prefetch_files(index for index, _ in files.values())
+
+            while pending:
+                for key, item in list(pending.items()):
+                    file_index, file_size = files[key]
+                    stats = engine.get_progress(file_index, file_size)
+                    self._emit('progress', item, index=file_index, downloaded=stats.downloaded,
+                               total=stats.total, percent=round(stats.percent, 2), rate=stats.rate)
+                    if stats.downloaded >= file_size:
+                        self._emit('done', item, index=file_index)
+                        del pending[key]
+                if pending and self._stop.wait(self.interval):
+                    break
+        except InterruptedError:
+            pass
+        except Exception as e:
+            for item in pending.values():
+                self._emit('error', item, error=str(e))
+            return failed + len(pending)
+        finally:
+            # Only once every item of this torrent has finished or given up
+            engine.close()
+
+        # Anything still pending was interrupted by a stop request
+        for key, item in pending.items():
+            self._emit('stopped', item, **({'index': files[key][0]} if key in files else {}))
+        return failed + len(pending)
+
+    def _emit(self, event: str, item: BatchItem, **fields) -> None:
+        record = {'event': event, 'magnet': item.magnet, 'time': round(time.time(), 3), **fields}
+        with self._out_lock:
+            self.out.write(json.dumps(record) + '\n')
+            self.out.flush()
+
+
+def run_batch(source: str, save_path: str, jobs: int) -> int:
+    """
+    Run a batch from a file path, or stdin when source is '-'. Returns the
+    exit code: 0 on success, 1 if any item failed, 2 on unreadable input.
+    """
+    try:
+        if source == '-':
+            items = parse_items(sys.stdin)
+        else:
+            with open(source, encoding='utf-8') as f:
+                items = parse_items(f)
+    except (OSError, ValueError) as e:
+        print(f"Invalid batch input: {e}", file=sys.stderr)
+        return 2
+
+    engine = TorrentEngine(save_path)
+    try:
+        failed = BatchDownloader(engine, jobs=jobs).run(items)
+    except KeyboardInterrupt:
+        return 130
+    return 1 if failed else 0
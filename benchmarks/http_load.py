@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Concurrent-viewer load test for the browser UI's /stream_file endpoint.
+
+Starts the FastAPI app in a child process, points N simulated viewers at a
+local media file and reports request latency percentiles, throughput, the
+server's event-loop lag and its CPU/RSS usage.
+
+    python benchmarks/http_load.py --viewers 50 --duration 30
+    python benchmarks/http_load.py --file ./out/Movie.mkv --bitrate 0 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATS_PATH = "/__loadtest/stats"
+MIB = 1024 * 1024
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentiles(values: list[float]) -> dict:
+    """p50/p90/p99/max of the values (nearest rank), in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    return {
+        "p50": round(rank(50), 2),
+        "p90": round(rank(90), 2),
+        "p99": round(rank(99), 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# --- server side -----------------------------------------------------------
+
+def serve(port: int, probe_interval: float) -> None:
+    """Run the app with an event-loop lag probe and a stats endpoint."""
+    sys.path.insert(0, ROOT_DIR)
+    import uvicorn
+    from browser_ui.server import app
+
+    lags: deque = deque(maxlen=100_000)
+    started = {"wall": time.monotonic(), "cpu": sum(os.times()[:2])}
+
+    async def stats(reset: bool = False):
+        now, cpu = time.monotonic(), sum(os.times()[:2])
+        result = {
+            "loop_lag_ms": _percentiles(list(lags)),
+            "cpu_percent": round(100 * (cpu - started["cpu"]) / max(now - started["wall"], 1e-9), 1),
+            "rss_bytes": _rss_bytes(),
+        }
+        if reset:
+            lags.clear()
+            started.update(wall=now, cpu=cpu)
+        return result
+
+    app.add_api_route(STATS_PATH, stats, methods=["GET"])
+
+    async def probe():
+        while True:
+            t0 = time.monotonic()
+            await asyncio.sleep(probe_interval)
+            lags.append(max(0.0, time.monotonic() - t0 - probe_interval))
+
+    async def main():
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        probe_task = asyncio.create_task(probe())
+        try:
+            await uvicorn.Server(config).serve()
+        finally:
+            probe_task.cancel()
+
+    asyncio.run(main())
+
+
+# --- client side -----------------------------------------------------------
+
+@dataclass
+class Sample:
+    kind: str       # sequential, seek or abandon
+    ttfb: float     # seconds until response headers
+    total: float    # seconds until the body was read (or abandoned)
+    nbytes: int
+    ok: bool
+
+
+class Viewer:
+    """One simulated viewer mixing sequential reads, seeks and abandoned streams."""
+
+    BEHAVIOURS = ("sequential", "seek", "abandon")
+
+    def __init__(self, client, url: str, file_size: int, args, rng: random.Random, samples: list):
+        self.client = client
+        self.url = url
+        self.file_size = file_size
+        self.chunk = args.chunk * MIB
+        self.bitrate = args.bitrate * 1_000_000 / 8  # bytes per second
+        self.weights = (args.sequential_weight, args.seek_weight, args.abandon_weight)
+        self.rng = rng
+        self.samples = samples
+
+    async def run(self, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            behaviour = self.rng.choices(self.BEHAVIOURS, weights=self.weights)[0]
+            if behaviour == "sequential":
+                pos = self.rng.randrange(0, max(1, self.file_size // 10))
+                for _ in range(self.rng.randint(5, 20)):
+                    if time.monotonic() >= deadline or pos >= self.file_size:
+                        break
+                    pos += await self._read_range("sequential", pos, self.chunk)
+            elif behaviour == "seek":
+                for _ in range(self.rng.randint(1, 3)):
+                    pos = self.rng.randrange(0, self.file_size)
+                    await self._read_range("seek", pos, self.chunk)
+            else:
+                pos = self.rng.randrange(0, self.file_size)
+                await self._abandon(pos, self.rng.randint(1, self.chunk))
+
+    async def _read_range(self, kind: str, start: int, length: int) -> int:
+        end = min(start + length, self.file_size) - 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        t0 = time.monotonic()
+        nbytes, ttfb, ok = 0, 0.0, False
+        try:
+            async with self.client.stream("GET", self.url, headers=headers) as response:
+                ttfb = time.monotonic() - t0
+                async for chunk in response.aiter_raw():
+                    nbytes += len(chunk)
+                ok = response.status_code == 206 and nbytes == end - start + 1
+        except Exception:
+            pass
+        self._record(kind, t0, ttfb, nbytes, ok)
+        await self._pace(t0, nbytes)
+        return max(nbytes, 1)
+
+    async def _abandon(self, start: int, keep: int) -> None:
+        """Open an unbounded range, read a little, then drop the connection."""
+        t0 = time.monotonic()
+        nbytes, ttfb, ok = 0, 0.0, False
+        try:
+            async with self.client.stream("GET", self.url, headers={"Range": f"bytes={start}-"}) as response:
+                ttfb = time.monotonic() - t0
+                ok = response.status_code == 206
+                async for chunk in response.aiter_raw():
+                    nbytes += len(chunk)
+                    if nbytes >= keep:
+                        break
+        except Exception:
+            ok = False
+        self._record("abandon", t0, ttfb, nbytes, ok)
+
+    def _record(self, kind: str, t0: float, ttfb: float, nbytes: int, ok: bool) -> None:
+        self.samples.append(Sample(kind, ttfb, time.monotonic() - t0, nbytes, ok))
+
+    async def _pace(self, t0: float, nbytes: int) -> None:
+        # Viewers consume at the playback bitrate rather than as fast as possible
+        if self.bitrate > 0:
+            await asyncio.sleep(max(0.0, nbytes / self.bitrate - (time.monotonic() - t0)))
+
+
+async def _wait_ready(client, base_url: str, proc: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            if (await client.get(base_url + STATS_PATH)).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError("server did not start in time")
+
+
+async def run_load(args, media_path: str, proc: subprocess.Popen, base_url: str) -> dict:
+    import httpx
+
+    file_size = os.path.getsize(media_path)
+    url = f"{base_url}/stream_file"
+    limits = httpx.Limits(max_connections=args.viewers * 2, max_keepalive_connections=args.viewers)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0, params={"file_path": media_path}) as client:
+        await _wait_ready(client, base_url, proc)
+        await client.get(base_url + STATS_PATH, params={"reset": True})
+
+        samples: list[Sample] = []
+        rng = random.Random(args.seed)
+        viewers = [
+            Viewer(client, url, file_size, args, random.Random(rng.random()), samples)
+            for _ in range(args.viewers)
+        ]
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(viewer.run(deadline) for viewer in viewers))
+        elapsed = time.monotonic() - started
+
+        server = (await client.get(base_url + STATS_PATH)).json()
+
+    total_bytes = sum(s.nbytes for s in samples)
+    by_kind = {}
+    for kind in Viewer.BEHAVIOURS:
+        kind_samples = [s for s in samples if s.kind == kind]
+        by_kind[kind] = {
+            "requests": len(kind_samples),
+            "errors": sum(not s.ok for s in kind_samples),
+            "ttfb_ms": _percentiles([s.ttfb for s in kind_samples if s.ok]),
+            "total_ms": _percentiles([s.total for s in kind_samples if s.ok]),
+        }
+    return {
+        "viewers": args.viewers,
+        "duration_s": round(elapsed, 2),
+        "file_size": file_size,
+        "requests": len(samples),
+        "errors": sum(not s.ok for s in samples),
+        "requests_per_s": round(len(samples) / elapsed, 1),
+        "throughput_mib_s": round(total_bytes / MIB / elapsed, 2),
+        "ttfb_ms": _percentiles([s.ttfb for s in samples if s.ok]),
+        "by_kind": by_kind,
+        "server": server,
+    }
+
+
+def _make_media_file(size_mib: int) -> str:
+    """Write a throwaway payload standing in for a fully seeded download."""
+    fd, path = tempfile.mkstemp(prefix="ez-stream-load-", suffix=".mkv")
+    block = os.urandom(MIB)
+    with os.fdopen(fd, "wb") as f:
+        for _ in range(size_mib):
+            f.write(block)
+    return path
+
+
+def _print_report(report: dict) -> None:
+    def fmt(p: dict) -> str:
+        return " ".join(f"{k}={v}" for k, v in p.items()) or "-"
+
+    server = report["server"]
+    print(f"viewers={report['viewers']} duration={report['duration_s']}s "
+          f"requests={report['requests']} errors={report['errors']}")
+    print(f"throughput={report['throughput_mib_s']} MiB/s  rate={report['requests_per_s']} req/s")
+    print(f"ttfb (ms):     {fmt(report['ttfb_ms'])}")
+    for kind, stats in report["by_kind"].items():
+        print(f"  {kind:<11} n={stats['requests']:<6} err={stats['errors']:<4} "
+              f"total (ms): {fmt(stats['total_ms'])}")
+    print(f"loop lag (ms): {fmt(server['loop_lag_ms'])}")
+    print(f"server cpu={server['cpu_percent']}%  rss={server['rss_bytes'] / MIB:.1f} MiB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test the browser UI streaming endpoint.")
+    parser.add_argument("--viewers", "-n", type=int, default=20, help="Concurrent simulated viewers")
+    parser.add_argument("--duration", "-d", type=float, default=20.0, help="Test length in seconds")
+    parser.add_argument("--file", help="Media file to stream (default: a generated temporary file)")
+    parser.add_argument("--size", type=int, default=256, help="Size in MiB of the generated file")
+    parser.add_argument("--chunk", type=int, default=1, help="Range request size in MiB")
+    parser.add_argument("--bitrate", type=float, default=8.0,
+                        help="Playback bitrate in Mbit/s viewers are paced at (0 = unpaced)")
+    parser.add_argument("--sequential-weight", type=float, default=6.0)
+    parser.add_argument("--seek-weight", type=float, default=3.0)
+    parser.add_argument("--abandon-weight", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--probe-interval", type=float, default=0.05, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.probe_interval)
+        return 0
+
+    media_path = os.path.abspath(args.file) if args.file else _make_media_file(args.size)
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port),
+         "--probe-interval", str(args.probe_interval)],
+        cwd=ROOT_DIR,
+    )
+    try:
+        report = asyncio.run(run_load(args, media_path, proc, f"http://127.0.0.1:{port}"))
+    finally:
+        proc.terminate()
+        proc.wait()
+        if not args.file:
+            os.remove(media_path)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for each entry point.
+
+Every measurement runs in a fresh interpreter and records the process wall
+time, the time to import the entry module and the time of its first real
+piece of work (session creation, first HTTP request, ...).
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 10 --importtime --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (import statement, init statement run after the import)
+ENTRY_POINTS = {
+    "cli": ("import cli", "cli.ConsoleUI().parse_args(['magnet:?'])"),
+    "gui": ("import gui", None),
+    "server": (
+        "from browser_ui import server",
+        "import httpx, asyncio\n"
+        "async def first_request():\n"
+        "    transport = httpx.ASGITransport(app=server.app)\n"
+        "    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:\n"
+        "        assert (await client.get('/')).status_code == 200\n"
+        "asyncio.run(first_request())",
+    ),
+    "engine": ("from engine import TorrentEngine", "TorrentEngine(SAVE_PATH)"),
+}
+
+# Whole-process invocations, timed from the outside
+COMMANDS = {
+    "cli --help": [sys.executable, "cli.py", "--help"],
+    "python -c pass": [sys.executable, "-c", "pass"],
+}
+
+SNIPPET = """
+import json, sys, time
+SAVE_PATH = {save_path!r}
+t0 = time.perf_counter()
+exec({import_stmt!r})
+t1 = time.perf_counter()
+init_stmt = {init_stmt!r}
+if init_stmt is not None:
+    exec(init_stmt)
+t2 = time.perf_counter()
+sys.stdout.write(json.dumps({{"import": t1 - t0, "init": t2 - t1}}))
+"""
+
+
+def _run(args: list[str], cwd: str) -> tuple[float, subprocess.CompletedProcess]:
+    t0 = time.perf_counter()
+    proc = subprocess.run(args, cwd=cwd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{proc.stderr}")
+    return elapsed, proc
+
+
+def _summary(values: list[float]) -> dict:
+    ms = [v * 1000 for v in values]
+    return {"median": round(statistics.median(ms), 1), "min": round(min(ms), 1)}
+
+
+def measure_entry(name: str, repeat: int, save_path: str) -> dict:
+    import_stmt, init_stmt = ENTRY_POINTS[name]
+    code = SNIPPET.format(save_path=save_path, import_stmt=import_stmt, init_stmt=init_stmt)
+    wall, imports, inits = [], [], []
+    for _ in range(repeat):
+        elapsed, proc = _run([sys.executable, "-c", code], ROOT_DIR)
+        timings = json.loads(proc.stdout.strip().splitlines()[-1])
+        wall.append(elapsed)
+        imports.append(timings["import"])
+        inits.append(timings["init"])
+    result = {"process_ms": _summary(wall), "import_ms": _summary(imports)}
+    if init_stmt is not None:
+        result["init_ms"] = _summary(inits)
+    return result
+
+
+def top_imports(name: str, limit: int) -> list[tuple[str, float]]:
+    """The entry module's slowest direct imports (cumulative), from -X importtime."""
+    import_stmt, _ = ENTRY_POINTS[name]
+    _, proc = _run([sys.executable, "-X", "importtime", "-c", import_stmt], ROOT_DIR)
+    # "import X" or "from X import Y": the entry module is X, or X.Y for a submodule
+    words = import_stmt.split()
+    entry_modules = {words[1], f"{words[1]}.{words[-1]}"}
+    rows, children = [], []
+    # Lines are emitted children-first, with two spaces of indent per level
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((module.strip(), int(cumulative) / 1000))
+        elif depth == 0:
+            if module.strip() in entry_modules:
+                rows.extend(children)
+            children = []
+    return sorted(rows, key=lambda row: -row[1])[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure import and init cost per entry point.")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--only", choices=sorted(ENTRY_POINTS), action="append",
+                        help="Limit to these entry points")
+    parser.add_argument("--importtime", action="store_true",
+                        help="Also list each entry point's slowest imports")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    names = args.only or list(ENTRY_POINTS)
+    report = {"python": sys.version.split()[0], "entry_points": {}, "commands": {}}
+    with tempfile.TemporaryDirectory(prefix="ez-stream-startup-") as save_path:
+        for name in names:
+            entry = measure_entry(name, args.repeat, save_path)
+            if args.importtime:
+                entry["top_imports_ms"] = top_imports(name, 5)
+            report["entry_points"][name] = entry
+    for label, command in COMMANDS.items():
+        report["commands"][label] = _summary([_run(command, ROOT_DIR)[0] for _ in range(args.repeat)])
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"python {report['python']}, {args.repeat} runs each (median / min ms)")
+    for name, entry in report["entry_points"].items():
+        parts = [f"{key[:-3]} {value['median']} / {value['min']}"
+                 for key, value in entry.items() if key.endswith("_ms") and key != "top_imports_ms"]
+        print(f"  {name:<8} " + "  ".join(parts))
+        for module, ms in entry.get("top_imports_ms", []):
+            print(f"             {module:<30} {ms:.1f}")
+    for label, value in report["commands"].items():
+        print(f"  {label:<16} process {value['median']} / {value['min']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
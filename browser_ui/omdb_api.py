@@ -1,7 +1,5 @@
 import urllib.parse
 
-import httpx
-
 OMDB_API_KEY = 'c9095ed5'
 
 def build_omdb_api_req(url: str):
@@ -10,6 +8,7 @@ def build_omdb_api_req(url: str):
 async def search_imdb(query: str):
     url = build_omdb_api_req(f'https://www.omdbapi.com/?s={urllib.parse.quote(query)}')
     print(url)
+    import httpx
     async with httpx.AsyncClient() as client:
         response = await client.get(url)
         if response.status_code != 200:
@@ -25,6 +24,7 @@ async def search_imdb(query: str):
 
 async def search_imdb_details(imdb_id: str):
     url = build_omdb_api_req(f'https://www.omdbapi.com/?i={imdb_id}')
+    import httpx
     async with httpx.AsyncClient() as client:
         response = await client.get(url)
         if response.status_code != 200:
@@ -2,15 +2,15 @@ import mimetypes
 import sys
 import os
 import asyncio
+import threading
+from contextlib import asynccontextmanager
 
-from engine import TorrentEngine
-from downloader import TorrentDownloader
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from typing import Union
 
 from fastapi import FastAPI, Request, Body
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 import aiofiles
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
@@ -18,25 +18,59 @@ from fastapi.staticfiles import StaticFiles
 from omdb_api import search_imdb, search_imdb_details
 from torrents_api import search_torrents
 
-# Initialize TorrentEngine and TorrentDownloader globally
-# In a production app, consider dependency injection for better management
-torrent_engine = TorrentEngine("./out")
-torrent_downloader = TorrentDownloader(torrent_engine)
+# TorrentEngine and TorrentDownloader are shared globally, but only created on
+# the first torrent request so workers can serve pages without libtorrent
+# opening a session and binding its port.
+torrent_engine = None
+torrent_downloader = None
+_torrent_engine_lock = threading.Lock()
 
 
-app = FastAPI()
-app.mount("/static", StaticFiles(directory="static"), name="static")
+def _create_torrent_engine():
+    global torrent_engine, torrent_downloader
+    # Concurrent first requests each get here; only one creates the session
+    with _torrent_engine_lock:
+        if torrent_engine is None:
+            from engine import TorrentEngine
+            from downloader import TorrentDownloader
 
-templates = Jinja2Templates(directory="templates")
+            engine = TorrentEngine("./out")
+            torrent_downloader = TorrentDownloader(engine)
+            torrent_engine = engine
+    return torrent_engine, torrent_downloader
+
+
+async def get_torrent_engine():
+    if torrent_engine is not None:
+        return torrent_engine, torrent_downloader
+    # Opening the session binds a port and creates the save directory, which
+    # must not stall streams served from the event loop
+    return await asyncio.to_thread(_create_torrent_engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    if torrent_engine is not None:
+        await asyncio.to_thread(torrent_engine.close)
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+app = FastAPI(lifespan=lifespan)
+app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static"), check_dir=False), name="static")
+
+templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
 
 
 async def fetch_torrent_metadata(ml: str):
-    await asyncio.to_thread(torrent_engine.add_magnet, ml)
-    return await asyncio.to_thread(torrent_engine.fetch_metadata)
+    engine, _ = await get_torrent_engine()
+    await asyncio.to_thread(engine.add_magnet, ml)
+    return await asyncio.to_thread(engine.fetch_metadata)
 
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates.TemplateResponse(request, "index.html")
 
 @app.get("/search")
 async def search(q: str):
@@ -56,7 +90,7 @@ async def find_torrent(q: str):
 @app.get("/get_torrent_metadata")
 async def find_torrent_metadata(q: str):
     data = await fetch_torrent_metadata(q)
-    return { "data": data }
+    return { "data": data.to_dict() }
 
 @app.post("/download_file")
 async def download_file(magnet_link: str = Body(...), file_choice: Union[int, str] = Body(...), save_path: str = Body(...)):
@@ -65,7 +99,8 @@ async def download_file(magnet_link: str = Body(...), file_choice: Union[int, st
         return {"error": "Could not fetch torrent metadata."}
 
     try:
-        abs_path, file_index, file_size = await asyncio.to_thread(torrent_downloader.download_file,
+        _, downloader = await get_torrent_engine()
+        abs_path, file_index, file_size = await asyncio.to_thread(downloader.download_file,
             metadata, file_choice, save_path
         )
         return {"message": "Download started", "file_path": abs_path, "file_index": file_index, "file_size": file_size}
@@ -88,6 +123,9 @@ async def stream_file(file_path: str, request: Request):
         byte_range = range_header.replace("bytes=", "").split("-")
         start = int(byte_range[0])
         end = int(byte_range[1]) if len(byte_range) > 1 and byte_range[1] else file_size - 1
+        end = min(end, file_size - 1)
+        if start >= file_size or end < start:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{file_size}"})
         content_length = (end - start) + 1
         headers = {
             "Content-Range": f"bytes {start}-{end}/{file_size}",
@@ -108,7 +146,10 @@ async def stream_file(file_path: str, request: Request):
     async def file_iterator():
         async with aiofiles.open(file_path, mode="rb") as f:
             await f.seek(start)
-            while (chunk := await f.read(8192)):
+            remaining = content_length
+            # Stop at the end of the requested range, not the end of the file
+            while remaining > 0 and (chunk := await f.read(min(8192, remaining))):
+                remaining -= len(chunk)
                 yield chunk
 
     return StreamingResponse(file_iterator(), media_type=media_type, headers=headers, status_code=status_code)
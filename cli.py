@@ -4,21 +4,29 @@ Command-line entry point for the torrent streamer.
 """
 import sys
 
-from downloader import TorrentDownloader
-from engine import TorrentEngine
-from player import VLCPlayer
-from ui import ConsoleUI, UI
-from controller import TorrentStreamerController
+from ui import ConsoleUI
 
 
 def main() -> int:
     # UI handles CLI args and user interactions
-    ui: UI = ConsoleUI()
+    ui = ConsoleUI()
+    args = ui.parse_args()
+
+    # Imported after argument parsing so --help and usage errors stay fast
+    if args.batch:
+        from batch import run_batch
+        return run_batch(args.batch, args.save_path, args.jobs)
+
+    from downloader import TorrentDownloader
+    from engine import TorrentEngine
+    from player import MPVPlayer, VLCPlayer
+    from controller import TorrentStreamerController
+
     magnet, save_path = ui.get_parameters()
 
     engine = TorrentEngine(save_path)
     downloader = TorrentDownloader(engine)
-    player = VLCPlayer()
+    player = MPVPlayer() if args.player == 'mpv' else VLCPlayer()
     controller = TorrentStreamerController(engine, downloader, player, ui)
     controller.stream(magnet, save_path)
     return 0
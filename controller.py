@@ -2,9 +2,9 @@
 Controller layer for the torrent streamer: ties engine, UI, and player together.
 """
 import time
-from typing import Union
+from typing import Optional, Union
 
-from model import DownloadStats
+from model import DownloadStats, TorrentMetadata
 from downloader import TorrentDownloader
 from engine import TorrentEngine
 from player import Player
@@ -25,6 +25,7 @@ class TorrentStreamerController:
         self.downloader = downloader
         self.player = player
         self.ui = ui
+        self._playhead: Optional[int] = None
 
     def stream(self, magnet: str, save_path: str) -> None:
         # add magnet and fetch metadata
@@ -50,15 +51,38 @@ class TorrentStreamerController:
         # launch player
         self.ui.show_launching_player()
         proc = self.player.play(abs_path)
+        self._playhead = None
 
         # monitor download progress until player exits
         try:
             while proc.poll() is None:
                 stats: DownloadStats = self.engine.get_progress(file_index, file_size)
+                stats.buffered_ahead = self._follow_playhead(metadata, file_index)
                 self.ui.show_progress(stats)
                 time.sleep(1)
             self.ui.newline()
         except KeyboardInterrupt:
             pass
         finally:
-            self.engine.save_resume_data()
\ No newline at end of file
+            self.engine.save_resume_data()
+
+    def _follow_playhead(self, metadata: TorrentMetadata, file_index: int) -> Optional[int]:
+        """
+        Move the download window to wherever the player is reading and return
+        how many bytes are buffered ahead of it, if the player reports it.
+        """
+        status = self.player.get_status()
+        if status is None:
+            return None
+
+        first, last = metadata.piece_range(file_index)
+        position = min(max(status.position, 0.0), 1.0)
+        piece = min(first + int(position * (last - first + 1)), last)
+
+        # Sequential playback is already covered by the initial schedule;
+        # only a seek or a backwards jump needs the deadlines redone.
+        if self._playhead is not None and (status.seeked or piece < self._playhead):
+            self.engine.reschedule_from(piece, last)
+        self._playhead = piece
+
+        return self.engine.contiguous_pieces(piece, last) * metadata.piece_size
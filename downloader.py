@@ -2,9 +2,9 @@
 Downloader service for handling the torrent session and file download.
 """
 import os
-from typing import Union
+from typing import Iterable, Optional, Union
 
-from model import TorrentMetadata, TorrentFile
+from model import TorrentMetadata
 from engine import TorrentEngine
 
 
@@ -15,42 +15,56 @@ class TorrentDownloader:
         self.engine = engine
 
     def download_file(
-        self, metadata: TorrentMetadata, file_choice: Union[int, str], save_path: str
+        self,
+        metadata: TorrentMetadata,
+        file_choice: Optional[Union[int, str]],
+        save_path: str,
     ) -> tuple[str, int, int]:
         """
         Selects a file from the torrent, starts downloading it, and returns the
         absolute path to the file on disk, its index, and its size.
         """
-        file_index = self._resolve_file_choice(metadata.files, file_choice)
-        chosen_file = metadata.files[file_index]
+        file_index = self.resolve_file_choice(metadata, file_choice)
 
-        offset, file_size = self.engine.select_file(file_index)
+        _, file_size = self.engine.select_file(file_index)
 
         # Buffer header piece
-        first_piece = offset // metadata.piece_size
+        first_piece, last_piece = metadata.piece_range(file_index)
         self.engine.wait_piece(first_piece)
 
         # Queue remaining pieces sequentially for streaming
-        last_piece = (offset + file_size - 1) // metadata.piece_size
         self.engine.schedule_pieces(first_piece + 1, last_piece)
 
-        abs_path = os.path.abspath(os.path.join(save_path, chosen_file.path))
-        return abs_path, file_index, chosen_file.size
+        abs_path = os.path.abspath(os.path.join(save_path, metadata.paths[file_index]))
+        return abs_path, file_index, file_size
 
-    def _resolve_file_choice(
-        self, files: list[TorrentFile], choice: Union[int, str]
+    def prefetch_files(self, file_indices: Iterable[int]) -> None:
+        """
+        Selects files for a plain background download, without streaming
+        deadlines. Every other file in the torrent is skipped.
+        """
+        self.engine.select_files(file_indices)
+
+    def resolve_file_choice(
+        self, metadata: TorrentMetadata, choice: Optional[Union[int, str]]
     ) -> int:
-        """Resolves a user's file choice (int or str) to a file index."""
+        """
+        Resolves a user's file choice (int or str) to a file index. An empty
+        choice picks the torrent's main video file.
+        """
+        if choice is None or choice == "":
+            return metadata.main_file
+
         if isinstance(choice, int):
-            if 0 <= choice < len(files):
+            if 0 <= choice < len(metadata.paths):
                 return choice
             else:
                 raise IndexError(f"File index {choice} is out of range.")
 
         if isinstance(choice, str):
-            for file in files:
-                if choice in file.path:
-                    return file.index
-            raise FileNotFoundError(f"No file found matching '{choice}'.")
+            index = metadata.find(choice)
+            if index is None:
+                raise FileNotFoundError(f"No file found matching '{choice}'.")
+            return index
 
         raise TypeError("File choice must be an integer index or string name.")
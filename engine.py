@@ -2,28 +2,52 @@
 Torrent engine abstraction using python-libtorrent.
 """
 import os
+import threading
 import time
+from array import array
+from typing import Iterable, Optional
+
 import libtorrent as lt
 
-from model import TorrentFile, TorrentMetadata, DownloadStats
+from model import TorrentMetadata, DownloadStats
 
 
 class TorrentEngine:
     """Handles interaction with libtorrent for metadata and streaming."""
 
-    def __init__(self, save_path: str):
+    def __init__(
+        self,
+        save_path: str,
+        session: Optional[lt.session] = None,
+        alert_lock: Optional[threading.Lock] = None,
+    ):
         self.save_path = save_path
         self.resume_dir = os.path.join(save_path, ".resume")
         os.makedirs(self.resume_dir, exist_ok=True)
 
-        settings = {
-            "user_agent": "ez-stream/0.1.0",
-            "listen_interfaces": "0.0.0.0:6881",
-            "enable_dht": True,
-            "alert_mask": lt.alert_category.all,
-        }
-        self.session = lt.session(settings)
+        if session is None:
+            settings = {
+                "user_agent": "ez-stream/0.1.0",
+                "listen_interfaces": "0.0.0.0:6881",
+                "enable_dht": True,
+                "alert_mask": lt.alert_category.all,
+            }
+            session = lt.session(settings)
+        self.session = session
+        # Engines sharing a session must not pop each other's alerts mid-save
+        self._alert_lock = alert_lock or threading.Lock()
         self.handle = None
+        self.metadata: Optional[TorrentMetadata] = None
+        self._selected: Optional[int] = None
+
+    def spawn(self) -> "TorrentEngine":
+        """Return a new engine for another torrent on this engine's session."""
+        return TorrentEngine(self.save_path, self.session, self._alert_lock)
+
+    @staticmethod
+    def info_hash(magnet_uri: str) -> str:
+        """Return the v1 info-hash of a magnet URI as a hex string."""
+        return str(lt.parse_magnet_uri(magnet_uri).info_hashes.v1)
 
     def add_magnet(self, magnet_uri: str) -> None:
         """Add a magnet URI to the session, loading resume data if available."""
@@ -48,41 +72,70 @@ class TorrentEngine:
         params.save_path = self.save_path
         params.storage_mode = lt.storage_mode_t.storage_mode_sparse
         self.handle = self.session.add_torrent(params)
-
-    def fetch_metadata(self) -> TorrentMetadata:
-        """Block until torrent metadata is available and return it."""
+        self.metadata = None
+        self._selected = None
+
+    def fetch_metadata(
+        self, timeout: Optional[float] = None, cancel: Optional[threading.Event] = None
+    ) -> TorrentMetadata:
+        """
+        Block until torrent metadata is available and return it. Setting the
+        cancel event aborts the wait with InterruptedError.
+        """
         assert self.handle, "Magnet URI must be added first"
+        deadline = None if timeout is None else time.monotonic() + timeout
         while not self.handle.has_metadata():
-            self.session.pop_alerts() # Clear alerts to avoid buffer buildup
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("Timed out waiting for torrent metadata")
+            if cancel is not None and cancel.is_set():
+                raise InterruptedError("Stopped while waiting for torrent metadata")
+            with self._alert_lock:
+                self.session.pop_alerts() # Clear alerts to avoid buffer buildup
             time.sleep(0.1)
+        if self.metadata is not None:
+            return self.metadata
         info = self.handle.get_torrent_info()
-        piece_size = info.piece_length()
-        files = []
         storage = info.files()
-        for idx in range(storage.num_files()):
-            files.append(
-                TorrentFile(
-                    index=idx,
-                    path=storage.file_path(idx),
-                    size=storage.file_size(idx),
-                )
-            )
-        return TorrentMetadata(name=info.name(), piece_size=piece_size, files=files)
+        count = storage.num_files()
+        self.metadata = TorrentMetadata(
+            name=info.name(),
+            piece_size=info.piece_length(),
+            paths=[storage.file_path(idx) for idx in range(count)],
+            offsets=array('q', (storage.file_offset(idx) for idx in range(count))),
+            sizes=array('q', (storage.file_size(idx) for idx in range(count))),
+        )
+        return self.metadata
 
     def select_file(self, index: int) -> tuple[int, int]:
         """Prioritize a single file by index; return its offset and size."""
         assert self.handle, "Magnet URI must be added first"
-        info = self.handle.get_torrent_info()
-        storage = info.files()
-        count = storage.num_files()
+        metadata = self.fetch_metadata()
+        count = len(metadata.paths)
         if index < 0 or index >= count:
             raise IndexError(f"file index {index} out of range")
+        if self._selected is None:
+            # First selection: switch every other file off in one call
+            priorities = [0] * count
+            priorities[index] = 1
+            self.handle.prioritize_files(priorities)
+        elif self._selected != index:
+            self.handle.file_priority(self._selected, 0)
+            self.handle.file_priority(index, 1)
+        self._selected = index
+        return metadata.offsets[index], metadata.sizes[index]
+
+    def select_files(self, indices: Iterable[int]) -> None:
+        """Download exactly the given files, at normal priority."""
+        assert self.handle, "Magnet URI must be added first"
+        count = len(self.fetch_metadata().paths)
         priorities = [0] * count
-        priorities[index] = 1
+        for index in indices:
+            if index < 0 or index >= count:
+                raise IndexError(f"file index {index} out of range")
+            priorities[index] = 1
         self.handle.prioritize_files(priorities)
-        file_offset = storage.file_offset(index)
-        file_size = storage.file_size(index)
-        return file_offset, file_size
+        # The next select_file must reset every priority again
+        self._selected = None
 
     def wait_piece(self, piece: int, timeout: float = 0.2) -> None:
         """Block until the given piece index has been downloaded."""
@@ -95,6 +148,21 @@ class TorrentEngine:
         for i, piece in enumerate(range(start, end + 1), start=1):
             self.handle.set_piece_deadline(piece, i * 1000)
 
+    def reschedule_from(self, start: int, end: int) -> None:
+        """Drop existing deadlines and stream sequentially from a new piece."""
+        self.handle.clear_piece_deadlines()
+        self.handle.set_piece_deadline(start, 0)
+        self.schedule_pieces(start + 1, end)
+
+    def contiguous_pieces(self, start: int, end: int) -> int:
+        """Count the pieces already downloaded in an unbroken run from start."""
+        count = 0
+        for piece in range(start, end + 1):
+            if not self.handle.have_piece(piece):
+                break
+            count += 1
+        return count
+
     def get_progress(self, file_index: int, file_size: int) -> DownloadStats:
         """Return the current download stats for the selected file."""
         downloaded = self.handle.file_progress()[file_index]
@@ -112,13 +180,17 @@ class TorrentEngine:
         if not (self.handle and self.handle.is_valid() and self.handle.has_metadata()):
             return
 
+        with self._alert_lock:
+            self._save_resume_data()
+
+    def _save_resume_data(self):
         self.handle.save_resume_data(lt.save_resume_flags_t.save_info_dict)
 
         start_time = time.time()
         while time.time() - start_time < 5:  # 5-second timeout
             alerts = self.session.pop_alerts()
             for alert in alerts:
-                if isinstance(alert, lt.save_resume_data_alert):
+                if isinstance(alert, lt.save_resume_data_alert) and alert.handle == self.handle:
                     entry = lt.write_resume_data(alert.params)
                     data = lt.bencode(entry)
                     info_hash_str = str(alert.params.info_hashes.v1)
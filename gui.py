@@ -1,16 +1,127 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, font as tkfont
 import threading
+from typing import Callable, Sequence
 
 from model import TorrentFile, DownloadStats, sizeof_fmt
 from ui import UI
-from engine import TorrentEngine
-from player import VLCPlayer
-from controller import TorrentStreamerController
-from downloader import TorrentDownloader
+
+
+class UpdateQueue:
+    """
+    Thread-safe queue of pending widget updates, coalesced by key.
+
+    Worker threads post updates with `put`; only the latest update per key is
+    kept, and the Tk thread applies them in `drain`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[Callable, tuple]] = {}
+
+    def put(self, key: str, func: Callable, *args) -> None:
+        with self._lock:
+            # Re-insert so the update runs in the order it was last posted
+            self._pending.pop(key, None)
+            self._pending[key] = (func, args)
+
+    def drain(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for func, args in pending.values():
+            func(*args)
+
+
+class VirtualListbox(tk.Frame):
+    """
+    A Listbox that only renders the rows currently in view.
+
+    Items are positions into an external sequence; `format_row` turns a
+    position into its display text when the row scrolls into view.
+    """
+
+    def __init__(self, master, format_row: Callable[[int], str], **kwargs):
+        super().__init__(master, **kwargs)
+        self._format_row = format_row
+        self._items: Sequence[int] = ()
+        self._top = 0
+        self._visible = 1
+
+        self._listbox = tk.Listbox(self, activestyle="none")
+        self._scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y")
+        self._listbox.pack(side="left", fill="both", expand=True)
+
+        self._listbox.bind("<Configure>", self._on_configure)
+        self._listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self._listbox.bind("<Button-4>", lambda e: self.scroll(-3))
+        self._listbox.bind("<Button-5>", lambda e: self.scroll(3))
+
+    def bind_rows(self, sequence: str, func: Callable) -> None:
+        self._listbox.bind(sequence, func)
+
+    def set_items(self, items: Sequence[int]) -> None:
+        self._items = items
+        self._top = 0
+        self._render()
+
+    def item_at(self, y: int) -> int | None:
+        """Return the item under the given y coordinate, selecting its row."""
+        row = self._listbox.nearest(y)
+        if row < 0 or self._top + row >= len(self._items):
+            return None
+        self._listbox.selection_clear(0, tk.END)
+        self._listbox.selection_set(row)
+        return self._items[self._top + row]
+
+    def scroll(self, rows: int) -> None:
+        self._set_top(self._top + rows)
+
+    def _set_top(self, top: int) -> None:
+        top = max(0, min(top, len(self._items) - self._visible))
+        if top != self._top:
+            self._top = top
+            self._render()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self._set_top(int(float(args[0]) * len(self._items)))
+        elif action == "scroll":
+            step = self._visible if args[1] == "pages" else 1
+            self.scroll(int(args[0]) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_configure(self, event):
+        bbox = self._listbox.bbox(0)
+        if bbox:
+            line_height = bbox[3] + 1
+        else:
+            line_height = tkfont.Font(font=self._listbox.cget("font")).metrics("linespace") + 1
+        visible = max(1, event.height // line_height)
+        if visible != self._visible:
+            self._visible = visible
+            self._set_top(self._top)
+            self._render()
+
+    def _render(self):
+        self._listbox.delete(0, tk.END)
+        end = min(self._top + self._visible, len(self._items))
+        self._listbox.insert(tk.END, *(self._format_row(i) for i in self._items[self._top:end]))
+        total = len(self._items)
+        if total:
+            self._scrollbar.set(self._top / total, end / total)
+        else:
+            self._scrollbar.set(0.0, 1.0)
 
 
 class GUIUI(UI):
+    # How often queued worker updates are applied, in milliseconds
+    UPDATE_INTERVAL_MS = 50
+    # Delay before re-filtering the file list after a keystroke
+    FILTER_DELAY_MS = 150
+
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Torrent Streamer GUI")
@@ -18,13 +129,22 @@ class GUIUI(UI):
 
         self.magnet = tk.StringVar()
         self.save_path = tk.StringVar(value=".")
+        self.file_filter = tk.StringVar()
+
+        # Worker threads never touch widgets directly; see _post
+        self._updates = UpdateQueue()
 
         # For context-menu based file selection
         self._choice_event = threading.Event()
         self._choice = None
-        self._file_list = []
+        self._file_list: Sequence[TorrentFile] = ()
+        self._file_names: list[str] = []
+        self._matches: Sequence[int] = ()
+        self._last_filter = ""
+        self._filter_job = None
 
         self._setup_ui()
+        self.root.after(self.UPDATE_INTERVAL_MS, self._drain_updates)
 
     def _setup_ui(self):
         # Magnet link
@@ -45,10 +165,17 @@ class GUIUI(UI):
         self._status = tk.Label(self.root, text="Idle", anchor="w")
         self._status.pack(fill="x", padx=10)
 
-        # File listbox with context menu
-        self._file_listbox = tk.Listbox(self.root)
+        # File filter
+        frame = tk.Frame(self.root)
+        frame.pack(fill="x", padx=10, pady=(10, 0))
+        tk.Label(frame, text="Filter:").pack(side="left")
+        tk.Entry(frame, textvariable=self.file_filter).pack(side="left", fill="x", expand=True, padx=5)
+        self.file_filter.trace_add("write", self._on_filter_changed)
+
+        # File list with context menu
+        self._file_listbox = VirtualListbox(self.root, self._format_file_row)
         self._file_listbox.pack(fill="both", expand=True, padx=10, pady=10)
-        self._file_listbox.bind("<Button-3>", self._on_right_click)
+        self._file_listbox.bind_rows("<Button-3>", self._on_right_click)
 
         self._menu = tk.Menu(self.root, tearoff=0)
         self._menu.add_command(label="Play", command=self._play_selected)
@@ -67,17 +194,25 @@ class GUIUI(UI):
             messagebox.showerror("Error", "Please enter a magnet link.")
             return
 
-        threading.Thread(target=self._run_controller, daemon=True).start()
+        # Tk variables must be read on the Tk thread, so hand copies to the worker
+        self._params = (self.magnet.get(), self.save_path.get())
+        threading.Thread(target=self._run_controller, args=self._params, daemon=True).start()
 
-    def _run_controller(self):
-        engine = TorrentEngine(self.save_path.get())
+    def _run_controller(self, magnet: str, save_path: str):
+        # Loaded on the worker thread so the window opens without waiting on libtorrent
+        from engine import TorrentEngine
+        from player import VLCPlayer
+        from controller import TorrentStreamerController
+        from downloader import TorrentDownloader
+
+        engine = TorrentEngine(save_path)
         downloader = TorrentDownloader(engine)
         player = VLCPlayer()
         controller = TorrentStreamerController(engine, downloader, player, self)
-        controller.stream(self.magnet.get(), self.save_path.get())
+        controller.stream(magnet, save_path)
 
     def get_parameters(self) -> tuple[str, str]:
-        return self.magnet.get(), self.save_path.get()
+        return self._params
 
     def show_fetching_metadata(self) -> None:
         self._update_status("Fetching metadata...")
@@ -86,10 +221,39 @@ class GUIUI(UI):
         self._update_status(f"Metadata received: {name}")
 
     def list_files(self, files: list[TorrentFile]) -> None:
+        # Lower-cased names are built on the worker thread, off the Tk loop
+        names = [f.path.lower() for f in files]
+        self._post("files", self._set_files, files, names)
+
+    def _set_files(self, files: Sequence[TorrentFile], names: list[str]) -> None:
         self._file_list = files
-        self._file_listbox.delete(0, tk.END)
-        for f in files:
-            self._file_listbox.insert(tk.END, f"[{f.index}] {f.path} ({sizeof_fmt(f.size)})")
+        self._file_names = names
+        # Start from the full new list; old matches index into the previous one
+        self._matches = range(len(names))
+        self._last_filter = ""
+        self._apply_filter()
+
+    def _format_file_row(self, pos: int) -> str:
+        f = self._file_list[pos]
+        return f"[{f.index}] {f.path} ({sizeof_fmt(f.size)})"
+
+    def _on_filter_changed(self, *args):
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(self.FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        text = self.file_filter.get().strip().lower()
+        if not text:
+            self._matches = range(len(self._file_names))
+        else:
+            # Narrowing the filter only needs to search the previous matches
+            candidates = self._matches if text.startswith(self._last_filter) else range(len(self._file_names))
+            names = self._file_names
+            self._matches = [i for i in candidates if text in names[i]]
+        self._last_filter = text
+        self._file_listbox.set_items(self._matches)
 
     def prompt_file_choice(self, max_index: int) -> int:
         # Wait until user selects via context menu
@@ -106,10 +270,9 @@ class GUIUI(UI):
     def _on_right_click(self, event):
         # Show context menu on right click
         try:
-            idx = self._file_listbox.nearest(event.y)
-            # select the clicked line
-            self._file_listbox.selection_clear(0, tk.END)
-            self._file_listbox.selection_set(idx)
+            idx = self._file_listbox.item_at(event.y)
+            if idx is None:
+                return
             self._menu.post(event.x_root, event.y_root)
             self._current_idx = idx
         except tk.TclError:
@@ -137,14 +300,26 @@ class GUIUI(UI):
         text = (
             f"Downloaded {sizeof_fmt(stats.downloaded)} / {sizeof_fmt(stats.total)} "
             f"({stats.percent:.1f}%), rate {sizeof_fmt(stats.rate)}/s"
+            + (f", {sizeof_fmt(stats.buffered_ahead)} buffered ahead"
+               if stats.buffered_ahead is not None else "")
         )
-        self._progress_label.config(text=text)
+        self._post("progress", self._progress_label.config, {"text": text})
 
     def newline(self) -> None:
         self._update_status("")
 
     def _update_status(self, text: str):
-        self._status.config(text=text)
+        self._post("status", self._status.config, {"text": text})
+
+    def _post(self, key: str, func: Callable, *args) -> None:
+        """Queue a widget update to run on the Tk thread."""
+        self._updates.put(key, func, *args)
+
+    def _drain_updates(self):
+        try:
+            self._updates.drain()
+        finally:
+            self.root.after(self.UPDATE_INTERVAL_MS, self._drain_updates)
 
     def run(self):
         self.root.mainloop()
@@ -1,11 +1,20 @@
 """
 Data models for the torrent streaming layers.
 """
-from dataclasses import dataclass
-from typing import List
+import os
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Optional
 
 
-@dataclass
+VIDEO_EXTENSIONS = frozenset({
+    '.mkv', '.mp4', '.m4v', '.avi', '.mov', '.wmv', '.webm', '.mpg', '.mpeg', '.ts', '.flv',
+})
+
+
+@dataclass(slots=True)
 class TorrentFile:
     """Represents a single file within a torrent."""
     index: int
@@ -13,12 +22,131 @@ class TorrentFile:
     size: int
 
 
-@dataclass
+class PathList(Sequence):
+    """
+    All file paths of a torrent packed into one NUL-separated UTF-8 blob,
+    decoded on access. A name search is then a single bytes.find.
+    """
+
+    __slots__ = ('_blob', '_starts')
+
+    def __init__(self, paths: Sequence[str]):
+        self._starts = array('q', [0])
+        chunks = []
+        for path in paths:
+            chunk = path.encode() + b'\0'
+            chunks.append(chunk)
+            self._starts.append(self._starts[-1] + len(chunk))
+        self._blob = b''.join(chunks)
+
+    def __len__(self) -> int:
+        return len(self._starts) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('path index out of range')
+        return self._blob[self._starts[index]:self._starts[index + 1] - 1].decode()
+
+    def find(self, fragment: str) -> Optional[int]:
+        """Return the lowest index whose path contains the fragment."""
+        if '\0' in fragment:
+            return None
+        # UTF-8 is self-synchronising, so a byte match is a character match
+        pos = self._blob.find(fragment.encode())
+        if pos < 0:
+            return None
+        return bisect_right(self._starts, pos) - 1
+
+
+class FileList(Sequence):
+    """Read-only view over a TorrentMetadata that builds TorrentFiles on access."""
+
+    __slots__ = ('_metadata',)
+
+    def __init__(self, metadata: 'TorrentMetadata'):
+        self._metadata = metadata
+
+    def __len__(self) -> int:
+        return len(self._metadata.paths)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return TorrentFile(
+            index=index,
+            path=self._metadata.paths[index],
+            size=self._metadata.sizes[index],
+        )
+
+
+@dataclass(slots=True)
 class TorrentMetadata:
-    """High-level metadata for a torrent."""
+    """
+    High-level metadata for a torrent.
+
+    Paths are packed into a PathList and file offsets and sizes kept in flat
+    arrays; the piece map and main file are derived once on construction.
+    """
     name: str
     piece_size: int
-    files: List[TorrentFile]
+    paths: Sequence[str]
+    offsets: array
+    sizes: array
+    first_pieces: array = field(init=False, repr=False)
+    last_pieces: array = field(init=False, repr=False)
+    main_file: int = field(init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.paths, PathList):
+            self.paths = PathList(self.paths)
+        piece_size = self.piece_size
+        self.first_pieces = array('l', (off // piece_size for off in self.offsets))
+        self.last_pieces = array('l', (
+            max(first, (off + size - 1) // piece_size)
+            for first, off, size in zip(self.first_pieces, self.offsets, self.sizes)
+        ))
+        self.main_file = self._find_main_file()
+
+    @property
+    def files(self) -> FileList:
+        return FileList(self)
+
+    def piece_range(self, index: int) -> tuple[int, int]:
+        """Return the first and last piece indices covering a file."""
+        return self.first_pieces[index], self.last_pieces[index]
+
+    def find(self, fragment: str) -> Optional[int]:
+        """Return the lowest file index whose path contains the fragment."""
+        return self.paths.find(fragment)
+
+    def to_dict(self) -> dict:
+        """Plain representation for JSON responses."""
+        return {
+            'name': self.name,
+            'piece_size': self.piece_size,
+            'main_file': self.main_file,
+            'files': [
+                {'index': idx, 'path': path, 'size': size}
+                for idx, (path, size) in enumerate(zip(self.paths, self.sizes))
+            ],
+        }
+
+    def _find_main_file(self) -> int:
+        """The largest video file, falling back to the largest file."""
+        best, best_video = -1, -1
+        for idx, (path, size) in enumerate(zip(self.paths, self.sizes)):
+            if best < 0 or size > self.sizes[best]:
+                best = idx
+            if os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+                if best_video < 0 or size > self.sizes[best_video]:
+                    best_video = idx
+        return best_video if best_video >= 0 else max(best, 0)
 
 
 @dataclass
@@ -28,6 +156,17 @@ class DownloadStats:
     total: int
     percent: float
     rate: float
+    # Bytes downloaded contiguously ahead of the playhead, when it is known
+    buffered_ahead: Optional[int] = None
+
+
+@dataclass
+class PlaybackStatus:
+    """Where a player currently is within the file it is playing."""
+    position: float  # fraction of the file, 0.0 - 1.0
+    time: float      # seconds
+    length: float    # seconds
+    seeked: bool = False  # a seek happened since the last status
 
 
 def sizeof_fmt(num: int, suffix: str = 'B') -> str:
@@ -36,4 +175,4 @@ def sizeof_fmt(num: int, suffix: str = 'B') -> str:
         if abs(num) < 1024.0:
             return f"{num:3.1f}{unit}{suffix}"
         num /= 1024.0
-    return f"{num:.1f}Y{suffix}"
\ No newline at end of file
+    return f"{num:.1f}Y{suffix}"
@@ -1,8 +1,25 @@
 """
 Player abstraction and implementations for streaming.
 """
+import base64
+import json
+import os
+import secrets
+import socket
 import subprocess
 import sys
+import tempfile
+import time
+from typing import Iterable, Optional
+
+from model import PlaybackStatus
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused localhost TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
 
 
 class Player:
@@ -12,13 +29,143 @@ class Player:
         """Start playing the given file path, returning the process handle."""
         raise NotImplementedError
 
+    def get_status(self) -> Optional[PlaybackStatus]:
+        """
+        Return where playback currently is, or None if the player does not
+        report its position (or is not ready yet).
+        """
+        return None
+
 
 class VLCPlayer(Player):
-    """Use VLC to play media files."""
+    """Use VLC to play media files, reading the position from its HTTP interface."""
+
+    # A jump this much larger than the elapsed wall time counts as a seek
+    SEEK_THRESHOLD = 3.0
+
+    def __init__(self, feedback: bool = True):
+        self.feedback = feedback
+        self._port = None
+        self._auth = None
+        self._last = None  # (media time, wall time) of the previous status
 
     def play(self, path: str) -> subprocess.Popen:
+        args = ['vlc', '--play-and-exit']
+        if self.feedback:
+            self._port = _free_port()
+            password = secrets.token_hex(8)
+            self._auth = 'Basic ' + base64.b64encode(f':{password}'.encode()).decode()
+            args += [
+                '--extraintf', 'http',
+                '--http-host', '127.0.0.1',
+                '--http-port', str(self._port),
+                '--http-password', password,
+            ]
         try:
-            return subprocess.Popen(['vlc', '--play-and-exit', path])
+            return subprocess.Popen(args + [path])
         except FileNotFoundError:
             print('VLC not found. Please ensure VLC is installed and in your PATH.')
-            sys.exit(1)
\ No newline at end of file
+            sys.exit(1)
+
+    def get_status(self) -> Optional[PlaybackStatus]:
+        if not self._port:
+            return None
+        import urllib.request  # deferred: pulls in http.client and ssl
+
+        request = urllib.request.Request(
+            f'http://127.0.0.1:{self._port}/requests/status.json',
+            headers={'Authorization': self._auth},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=0.5) as response:
+                data = json.load(response)
+        except (OSError, ValueError):
+            return None
+        if data.get('length', 0) <= 0:
+            return None
+
+        now = time.monotonic()
+        media_time = float(data.get('time', 0))
+        seeked = False
+        if self._last is not None:
+            expected = self._last[0] + (now - self._last[1])
+            seeked = abs(media_time - expected) > self.SEEK_THRESHOLD
+        self._last = (media_time, now)
+        return PlaybackStatus(
+            position=float(data.get('position', 0.0)),
+            time=media_time,
+            length=float(data['length']),
+            seeked=seeked,
+        )
+
+
+class MPVPlayer(Player):
+    """Use mpv to play media files, reading the position over its JSON IPC socket."""
+
+    def __init__(self):
+        self._ipc_path = None
+        self._sock = None
+        self._buffer = b''
+        self._request_id = 0
+        self._seeked = False
+
+    def play(self, path: str) -> subprocess.Popen:
+        self._ipc_path = os.path.join(tempfile.gettempdir(), f'ez-stream-mpv-{os.getpid()}.sock')
+        try:
+            return subprocess.Popen(['mpv', f'--input-ipc-server={self._ipc_path}', path])
+        except FileNotFoundError:
+            print('mpv not found. Please ensure mpv is installed and in your PATH.')
+            sys.exit(1)
+
+    def get_status(self) -> Optional[PlaybackStatus]:
+        if not self._ipc_path or not hasattr(socket, 'AF_UNIX'):
+            return None
+        try:
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._sock.settimeout(0.5)
+                self._sock.connect(self._ipc_path)
+            percent = self._get_property('percent-pos')
+            time_pos = self._get_property('time-pos')
+            duration = self._get_property('duration')
+        except OSError:
+            # mpv has not created the socket yet, or has exited
+            self._close()
+            return None
+        if percent is None or time_pos is None or not duration:
+            return None
+
+        seeked, self._seeked = self._seeked, False
+        return PlaybackStatus(
+            position=percent / 100.0, time=time_pos, length=duration, seeked=seeked
+        )
+
+    def _get_property(self, name: str):
+        self._request_id += 1
+        request_id = self._request_id
+        command = {'command': ['get_property', name], 'request_id': request_id}
+        self._sock.sendall(json.dumps(command).encode() + b'\n')
+        for message in self._messages():
+            if message.get('event') == 'seek':
+                self._seeked = True
+            elif message.get('request_id') == request_id:
+                return message.get('data') if message.get('error') == 'success' else None
+
+    def _messages(self) -> Iterable[dict]:
+        """Yield JSON messages from the socket until the read times out."""
+        while True:
+            while b'\n' not in self._buffer:
+                chunk = self._sock.recv(4096)
+                if not chunk:
+                    raise ConnectionResetError('mpv closed the IPC socket')
+                self._buffer += chunk
+            line, self._buffer = self._buffer.split(b'\n', 1)
+            if line.strip():
+                yield json.loads(line)
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._buffer = b''
+
@@ -0,0 +1,42 @@
+"""
+Test doubles shared by the test modules.
+"""
+from typing import Iterable, Optional
+
+from model import PlaybackStatus
+from player import Player
+
+
+class FakeProcess:
+    """Stand-in for subprocess.Popen that exits after a number of polls."""
+
+    def __init__(self, polls: int):
+        self._polls = polls
+        self.returncode = None
+
+    def poll(self) -> Optional[int]:
+        if self._polls <= 0:
+            self.returncode = 0
+            return self.returncode
+        self._polls -= 1
+        return None
+
+
+class FakePlayer(Player):
+    """
+    A scripted player: each get_status() call returns the next
+    PlaybackStatus, and the process exits once the script runs out.
+    """
+
+    def __init__(self, statuses: Iterable[Optional[PlaybackStatus]]):
+        self.statuses = list(statuses)
+        self.played = []
+
+    def play(self, path: str) -> FakeProcess:
+        self.played.append(path)
+        return FakeProcess(len(self.statuses))
+
+    def get_status(self) -> Optional[PlaybackStatus]:
+        if not self.statuses:
+            return None
+        return self.statuses.pop(0)
@@ -0,0 +1,183 @@
+"""
+Behaviour tests for headless batch mode.
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import BatchDownloader, BatchItem, parse_items, run_batch
+from model import DownloadStats, TorrentMetadata
+
+
+METADATA = TorrentMetadata(
+    name='show',
+    piece_size=10,
+    paths=['show/e01.mkv', 'show/e02.mkv', 'show/e03.mkv'],
+    offsets=array('q', [0, 100, 200]),
+    sizes=array('q', [100, 100, 100]),
+)
+
+
+class StubSession:
+    """Stands in for the shared engine; every spawned child is recorded."""
+
+    def __init__(self):
+        self.children = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def info_hash(magnet_uri: str) -> str:
+        if not magnet_uri.startswith('magnet:?xt=urn:btih:'):
+            raise ValueError('not a magnet URI')
+        return magnet_uri[len('magnet:?xt=urn:btih:'):].split('&')[0]
+
+    def spawn(self) -> 'StubEngine':
+        child = StubEngine()
+        with self._lock:
+            self.children.append(child)
+        return child
+
+
+class StubEngine:
+    """Records calls and reports every selected file complete on the second poll."""
+
+    def __init__(self):
+        self.added = []
+        self.selected = []
+        self.closed = 0
+        self._polls = {}
+
+    def add_magnet(self, magnet_uri: str) -> None:
+        self.added.append(magnet_uri)
+
+    def fetch_metadata(self, timeout=None, cancel=None) -> TorrentMetadata:
+        return METADATA
+
+    def select_files(self, indices) -> None:
+        self.selected.append(sorted(indices))
+
+    def get_progress(self, file_index: int, file_size: int) -> DownloadStats:
+        polls = self._polls[file_index] = self._polls.get(file_index, 0) + 1
+        downloaded = file_size if polls > 1 else 0
+        return DownloadStats(downloaded, file_size, downloaded * 100 / file_size, 0.0)
+
+    def close(self) -> None:
+        self.closed += 1
+
+
+class BatchDownloaderTest(unittest.TestCase):
+
+    def run_batch(self, items: list[BatchItem]) -> tuple[StubSession, list[dict], int]:
+        session = StubSession()
+        out = io.StringIO()
+        failed = BatchDownloader(session, jobs=2, out=out, interval=0).run(items)
+        events = [json.loads(line) for line in out.getvalue().splitlines()]
+        return session, events, failed
+
+    def test_same_torrent_shares_one_engine(self):
+        magnet = 'magnet:?xt=urn:btih:aaaa'
+        session, events, failed = self.run_batch([
+            BatchItem(magnet, file=0),
+            BatchItem(magnet + '&dn=show', file='e03'),
+        ])
+
+        self.assertEqual(failed, 0)
+        self.assertEqual(len(session.children), 1)
+        engine = session.children[0]
+        self.assertEqual(engine.added, [magnet])
+        self.assertEqual(engine.selected, [[0, 2]])
+        self.assertEqual(engine.closed, 1)
+        done = sorted(event['index'] for event in events if event['event'] == 'done')
+        self.assertEqual(done, [0, 2])
+        # The torrent is removed only after both files finished
+        self.assertEqual(events[-1]['event'], 'done')
+
+    def test_different_torrents_get_their_own_engine(self):
+        session, _, failed = self.run_batch([
+            BatchItem('magnet:?xt=urn:btih:aaaa', file=0),
+            BatchItem('magnet:?xt=urn:btih:bbbb', file=1),
+        ])
+
+        self.assertEqual(failed, 0)
+        self.assertEqual(sorted(child.selected[0][0] for child in session.children), [0, 1])
+        self.assertTrue(all(child.closed == 1 for child in session.children))
+
+    def test_higher_priority_starts_first(self):
+        session = StubSession()
+        items = [
+            BatchItem('magnet:?xt=urn:btih:low', priority=-1),
+            BatchItem('magnet:?xt=urn:btih:normal'),
+            BatchItem('magnet:?xt=urn:btih:high', priority=5),
+        ]
+        BatchDownloader(session, jobs=1, out=io.StringIO(), interval=0).run(items)
+
+        started = [child.added[0].rsplit(':', 1)[1] for child in session.children]
+        self.assertEqual(started, ['high', 'normal', 'low'])
+
+    def test_bad_selector_fails_only_its_item(self):
+        magnet = 'magnet:?xt=urn:btih:aaaa'
+        session, events, failed = self.run_batch([
+            BatchItem(magnet, file=1),
+            BatchItem(magnet, file='missing'),
+            BatchItem('not a magnet'),
+        ])
+
+        self.assertEqual(failed, 2)
+        self.assertEqual(session.children[0].selected, [[1]])
+        self.assertEqual([event['event'] for event in events].count('error'), 2)
+        self.assertEqual([event['event'] for event in events].count('done'), 1)
+
+
+class ParseItemsTest(unittest.TestCase):
+
+    def test_plain_and_json_lines(self):
+        items = parse_items([
+            '# queue',
+            '',
+            'magnet:?xt=urn:btih:a',
+            'magnet:?xt=urn:btih:b 3',
+            'magnet:?xt=urn:btih:c  episode 2 ',
+            '{"magnet": "magnet:?xt=urn:btih:d", "file": "3", "priority": 2}',
+            '{"magnet": "magnet:?xt=urn:btih:e", "file": "e01"}',
+        ])
+
+        self.assertEqual(items, [
+            BatchItem('magnet:?xt=urn:btih:a'),
+            BatchItem('magnet:?xt=urn:btih:b', file=3),
+            BatchItem('magnet:?xt=urn:btih:c', file='episode 2'),
+            BatchItem('magnet:?xt=urn:btih:d', file=3, priority=2),
+            BatchItem('magnet:?xt=urn:btih:e', file='e01'),
+        ])
+
+    def test_errors_name_the_line(self):
+        cases = {
+            '{"magnet": ': 'invalid JSON',
+            '{"file": 1}': "missing 'magnet'",
+            '{"magnet": "m", "priority": "high"}': "'priority' must be an integer",
+            '{"magnet": "m", "priority": true}': "'priority' must be an integer",
+            '{"magnet": "m", "file": [1]}': "'file' must be",
+        }
+        for line, message in cases.items():
+            with self.subTest(line=line):
+                with self.assertRaisesRegex(ValueError, f"^Line 2: .*{message}"):
+                    parse_items(['magnet:?xt=urn:btih:a', line])
+
+    def test_non_object_json_line(self):
+        with self.assertRaisesRegex(ValueError, "^Line 1: expected a JSON object"):
+            parse_items(['["magnet:?xt=urn:btih:a", 3]'])
+
+    def test_run_batch_rejects_bad_input(self):
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(run_batch(os.path.join('no', 'such', 'queue.txt'), '.', 1), 2)
+        self.assertIn('Invalid batch input', err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
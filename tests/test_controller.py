@@ -0,0 +1,69 @@
+"""
+Behaviour tests for the controller's playhead-driven prioritization.
+"""
+import os
+import sys
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controller import TorrentStreamerController
+from model import PlaybackStatus, TorrentMetadata
+from fakes import FakePlayer
+
+
+class StubEngine:
+    """Records rescheduling calls and reports a fixed contiguous buffer."""
+
+    def __init__(self, contiguous: int):
+        self.contiguous = contiguous
+        self.rescheduled = []
+
+    def reschedule_from(self, start: int, end: int) -> None:
+        self.rescheduled.append((start, end))
+
+    def contiguous_pieces(self, start: int, end: int) -> int:
+        return self.contiguous
+
+
+class FollowPlayheadTest(unittest.TestCase):
+
+    def setUp(self):
+        # One 1000-byte file over 10-byte pieces: pieces 0-99
+        self.metadata = TorrentMetadata(
+            name='test',
+            piece_size=10,
+            paths=['movie.mkv'],
+            offsets=array('q', [0]),
+            sizes=array('q', [1000]),
+        )
+        self.engine = StubEngine(contiguous=3)
+
+    def follow(self, *statuses):
+        player = FakePlayer(statuses)
+        controller = TorrentStreamerController(self.engine, None, player, None)
+        return [controller._follow_playhead(self.metadata, 0) for _ in statuses]
+
+    def test_returns_contiguous_bytes_ahead(self):
+        self.assertEqual(self.follow(PlaybackStatus(0.1, 1, 10)), [30])
+        self.assertEqual(self.engine.rescheduled, [])
+
+    def test_no_status_reports_nothing(self):
+        self.assertEqual(self.follow(None), [None])
+
+    def test_seek_reschedules_from_playhead(self):
+        self.follow(PlaybackStatus(0.1, 1, 10), PlaybackStatus(0.5, 5, 10, seeked=True))
+        self.assertEqual(self.engine.rescheduled, [(50, 99)])
+
+    def test_backwards_jump_reschedules(self):
+        self.follow(PlaybackStatus(0.5, 5, 10), PlaybackStatus(0.2, 2, 10))
+        self.assertEqual(self.engine.rescheduled, [(20, 99)])
+
+    def test_forward_playback_keeps_schedule(self):
+        self.follow(PlaybackStatus(0.2, 2, 10), PlaybackStatus(0.3, 3, 10))
+        self.assertEqual(self.engine.rescheduled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for parsing player position reports (VLC HTTP status, mpv JSON IPC).
+"""
+import io
+import json
+import os
+import socket
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from player import MPVPlayer, VLCPlayer
+
+
+def vlc_response(**data):
+    return io.BytesIO(json.dumps(data).encode())
+
+
+class VLCStatusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.player = VLCPlayer()
+        self.player._port = 1234
+        self.player._auth = 'Basic x'
+
+    def status(self, now: float, **data):
+        with mock.patch('urllib.request.urlopen', return_value=vlc_response(**data)), \
+                mock.patch('player.time.monotonic', return_value=now):
+            return self.player.get_status()
+
+    def test_reports_position(self):
+        status = self.status(100.0, time=30, length=120, position=0.25)
+        self.assertEqual((status.position, status.time, status.length), (0.25, 30.0, 120.0))
+        self.assertFalse(status.seeked)
+
+    def test_steady_playback_is_not_a_seek(self):
+        self.status(100.0, time=30, length=120, position=0.25)
+        status = self.status(102.0, time=32, length=120, position=0.27)
+        self.assertFalse(status.seeked)
+
+    def test_jump_beyond_wall_clock_is_a_seek(self):
+        self.status(100.0, time=30, length=120, position=0.25)
+        self.assertTrue(self.status(101.0, time=90, length=120, position=0.75).seeked)
+        # Backwards jumps count as well
+        self.assertTrue(self.status(102.0, time=10, length=120, position=0.08).seeked)
+
+    def test_unknown_length_reports_nothing(self):
+        self.assertIsNone(self.status(100.0, time=0, length=0, position=0.0))
+        self.assertIsNone(self.status(100.0, time=0, length=-1, position=0.0))
+
+    def test_unreachable_interface_reports_nothing(self):
+        with mock.patch('urllib.request.urlopen', side_effect=ConnectionRefusedError):
+            self.assertIsNone(self.player.get_status())
+
+    def test_disabled_feedback_reports_nothing(self):
+        self.assertIsNone(VLCPlayer(feedback=False).get_status())
+
+
+class MPVIPCTest(unittest.TestCase):
+
+    def setUp(self):
+        self.player = MPVPlayer()
+        self.player._ipc_path = 'unused'
+        self.player._sock, self.mpv = socket.socketpair()
+        self.player._sock.settimeout(0.5)
+
+    def tearDown(self):
+        self.player._close()
+        self.mpv.close()
+
+    def reply(self, *messages):
+        self.mpv.sendall(b''.join(json.dumps(m).encode() + b'\n' for m in messages))
+
+    def test_matches_request_id_and_skips_other_messages(self):
+        self.reply(
+            {'event': 'playback-restart'},
+            {'request_id': 99, 'error': 'success', 'data': 'stale'},
+            {'request_id': 1, 'error': 'success', 'data': 12.5},
+        )
+        self.assertEqual(self.player._get_property('time-pos'), 12.5)
+        self.assertFalse(self.player._seeked)
+        sent = json.loads(self.mpv.recv(4096).decode())
+        self.assertEqual(sent, {'command': ['get_property', 'time-pos'], 'request_id': 1})
+
+    def test_error_reply_is_none(self):
+        self.reply({'request_id': 1, 'error': 'property unavailable'})
+        self.assertIsNone(self.player._get_property('duration'))
+
+    def test_lines_split_across_reads(self):
+        line = json.dumps({'request_id': 1, 'error': 'success', 'data': 3}).encode() + b'\n'
+        # The first half arrived with an earlier read; the rest comes later
+        self.player._buffer = line[:7]
+        self.mpv.sendall(line[7:])
+        self.assertEqual(self.player._get_property('duration'), 3)
+
+    def test_interleaved_seek_event_is_reported_once(self):
+        self.reply(
+            {'request_id': 1, 'error': 'success', 'data': 50.0},
+            {'event': 'seek'},
+            {'request_id': 2, 'error': 'success', 'data': 60.0},
+            {'request_id': 3, 'error': 'success', 'data': 120.0},
+        )
+        status = self.player.get_status()
+        self.assertEqual((status.position, status.time, status.length), (0.5, 60.0, 120.0))
+        self.assertTrue(status.seeked)
+
+        self.reply(
+            {'request_id': 4, 'error': 'success', 'data': 51.0},
+            {'request_id': 5, 'error': 'success', 'data': 61.0},
+            {'request_id': 6, 'error': 'success', 'data': 120.0},
+        )
+        self.assertFalse(self.player.get_status().seeked)
+
+    def test_closed_socket_reports_nothing(self):
+        self.mpv.close()
+        self.assertIsNone(self.player.get_status())
+        self.assertIsNone(self.player._sock)
+
+
+if __name__ == '__main__':
+    unittest.main()
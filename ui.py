@@ -58,15 +58,37 @@ class UI(ABC):
 class ConsoleUI(UI):
     """Handles all console-based user interactions and displays."""
 
-    def get_parameters(self) -> tuple[str, str]:
+    def __init__(self):
+        self.args = None
+
+    def parse_args(self, argv=None) -> argparse.Namespace:
         parser = argparse.ArgumentParser(
             description='Stream a file from a magnet link via a pluggable player.'
         )
-        parser.add_argument('magnet', help='Magnet link to the torrent')
+        parser.add_argument('magnet', nargs='?', help='Magnet link to the torrent')
         parser.add_argument(
             '--save-path', '-o', default='.', help='Directory to save partial downloads'
         )
-        args = parser.parse_args()
+        parser.add_argument(
+            '--player', choices=['vlc', 'mpv'], default='vlc', help='Media player to stream to'
+        )
+        parser.add_argument(
+            '--batch', metavar='FILE',
+            help="Download a list of magnets headlessly ('-' reads stdin)"
+        )
+        parser.add_argument(
+            '--jobs', '-j', type=int, default=2, help='Concurrent downloads in batch mode'
+        )
+        args = parser.parse_args(argv)
+        if not args.magnet and not args.batch:
+            parser.error('a magnet link or --batch is required')
+        if args.jobs < 1:
+            parser.error('--jobs must be at least 1')
+        self.args = args
+        return args
+
+    def get_parameters(self) -> tuple[str, str]:
+        args = self.args or self.parse_args()
         return args.magnet, args.save_path
 
     def show_fetching_metadata(self) -> None:
@@ -80,7 +102,9 @@ class ConsoleUI(UI):
             print(f"[{f.index}] {f.path} ({sizeof_fmt(f.size)})")
 
     def prompt_file_choice(self, max_index: int) -> Union[int, str]:
-        raw_choice = input('Select file by index or name fragment to stream: ')
+        raw_choice = input(
+            'Select file by index or name fragment to stream (Enter for the main video): '
+        )
         try:
             # Try to interpret as an integer index first
             choice = int(raw_choice)
@@ -104,7 +128,9 @@ class ConsoleUI(UI):
     def show_progress(self, stats: DownloadStats) -> None:
         print(
             f"\rDownloaded {sizeof_fmt(stats.downloaded)} / {sizeof_fmt(stats.total)} "
-            f"({stats.percent:.1f}%), rate {sizeof_fmt(stats.rate)}/s",
+            f"({stats.percent:.1f}%), rate {sizeof_fmt(stats.rate)}/s"
+            + (f", {sizeof_fmt(stats.buffered_ahead)} buffered ahead"
+               if stats.buffered_ahead is not None else ""),
             end='',
             flush=True,
         )